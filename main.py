@@ -1,21 +1,104 @@
 # Python
+import hashlib
+import ipaddress
+import os
+import re
 from enum import Enum
-from typing import Optional
+from typing import Any, Callable, Optional
+
+# Third party
+import orjson
+from email_validator import SPECIAL_USE_DOMAIN_NAMES
 
 # FastAPO
 from fastapi import Body, Query, Path, Form, Header, Cookie, UploadFile, File
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi import status
 from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
 
 # Pydantic
 from pydantic import BaseModel, Field, IPvAnyAddress, HttpUrl, EmailStr, SecretStr
 
-app = FastAPI()
+
+class ORJSONRequest(Request):
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """
+    Route that decodes JSON request bodies with orjson instead of the stdlib json.
+    """
+
+    def get_route_handler(self) -> Callable:
+        original_route_handler = super().get_route_handler()
+
+        async def custom_route_handler(request: Request) -> Response:
+            return await original_route_handler(ORJSONRequest(request.scope, request.receive))
+
+        return custom_route_handler
+
+
+app = FastAPI(default_response_class=ORJSONResponse)
+app.router.route_class = ORJSONRoute
+
+
+def _orjson_default(value: Any) -> str:
+    # IP addresses are the only field values orjson can't serialize natively
+    if isinstance(value, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_response(content, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Serialize an already validated payload straight to a JSON response.
+
+    Skips FastAPI's jsonable_encoder and response_model pass. IP addresses are
+    rendered with str(); any other type orjson doesn't know raises TypeError.
+    """
+    return Response(
+        orjson.dumps(content, default=_orjson_default),
+        status_code=status_code,
+        media_type="application/json"
+    )
 
 
 #  Models
 
+# Plain ASCII addresses that email-validator is known to accept unchanged
+_EMAIL_RE = re.compile(
+    r"[A-Za-z0-9_%+-]+(?:\.[A-Za-z0-9_%+-]+)*"
+    r"@((?:(?=[A-Za-z0-9-]{1,63}\.)[A-Za-z0-9]+(?:-[A-Za-z0-9]+)*\.)+[A-Za-z]{2,63})"
+)
+
+
+class FastEmailStr(EmailStr):
+    """
+    EmailStr that accepts common addresses with a precompiled regex.
+
+    Anything the regex does not match (pretty "Name <email>" forms,
+    internationalized or special-use domains, very long addresses...) falls
+    back to the full email-validator check.
+    """
+
+    @classmethod
+    def validate(cls, value: str) -> str:
+        m = _EMAIL_RE.fullmatch(value)
+        if m and len(value) <= 254 and m.start(1) <= 65:
+            domain = m.group(1).lower()
+            if not any(
+                domain == name or domain.endswith("." + name)
+                for name in SPECIAL_USE_DOMAIN_NAMES
+            ):
+                return value[:m.start(1)] + domain
+        return super().validate(value)
+
+
 class HairColor(str, Enum):
     white = "white"
     brown = "brown"
@@ -25,18 +108,9 @@ class HairColor(str, Enum):
 
 
 class Location(BaseModel):
-    city: str = Field(
-        min_length=0,
-        max_length=20
-    )
-    state: str = Field(
-        min_length=0,
-        max_length=20
-    )
-    country: str = Field(
-        min_length=0,
-        max_length=20
-    )
+    city: str = Field(max_length=20)
+    state: str = Field(max_length=20)
+    country: str = Field(max_length=20)
 
     class Config:
         schema_extra = {
@@ -64,7 +138,7 @@ class Person(BaseModel):
     hair_color: Optional[HairColor] = None
     is_married: Optional[bool] = Field(default=None)
 
-    email: EmailStr = Field()
+    email: FastEmailStr = Field()
     addressIp: Optional[IPvAnyAddress] = Field()
     website_url: Optional[HttpUrl] = Field()
     password: str = Field(
@@ -93,13 +167,36 @@ class LoginOut(BaseModel):
     message: str = Field(default='Login successful :)', description='Description message')
 
 
+# The home payload never changes, serialize it once and let clients cache it
+_HOME_BODY = orjson.dumps({"hello": "World"})
+_HOME_ETAG = '"' + hashlib.sha256(_HOME_BODY).hexdigest()[:16] + '"'
+_HOME_HEADERS = {"etag": _HOME_ETAG, "cache-control": "public, max-age=3600"}
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against an ETag (RFC 7232).
+    """
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == "*" or tag == etag:
+            return True
+    return False
+
+
 @app.get(
     path="/",
     status_code=status.HTTP_200_OK,
     tags=["Home"]
 )  # path operation decorator
-def home():  # path operation function
-    return {"hello": "World"}  # JSON
+async def home(request: Request):  # path operation function
+    if _etag_matches(request.headers.get("if-none-match"), _HOME_ETAG):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_HOME_HEADERS)
+    return Response(_HOME_BODY, media_type="application/json", headers=_HOME_HEADERS)  # JSON
 
 
 #  Request and Response body
@@ -112,7 +209,7 @@ def home():  # path operation function
     tags=["Persons"],
     summary="Create a person in the app"
 )
-def create_person(person: Person = Body()):
+async def create_person(person: Person = Body()):
     """
     Create a new person in the app and save their information in the database.
 
@@ -141,7 +238,9 @@ def create_person(person: Person = Body()):
         - website_url: str
         - password: str (omitted)
     """
-    return person
+    result = person.__dict__.copy()
+    del result["password"]
+    return json_response(result, status_code=status.HTTP_201_CREATED)
 
 
 #  Validaciones: Querry parameters
@@ -152,7 +251,7 @@ def create_person(person: Person = Body()):
     tags=["Persons"],
     deprecated=True
 )
-def show_person(
+async def show_person(
         name: Optional[str] = Query(
             None,
             min_length=1,
@@ -180,14 +279,14 @@ def show_person(
 
 #  Validaciones: Path Parameters
 
-persons = [1, 2, 3, 4]
+persons = frozenset({1, 2, 3, 4})
 
 
 @app.get(
     path="/person/detail/{person_id}",
     status_code=status.HTTP_200_OK,
     tags=["Persons"])
-def show_person(
+async def show_person(
         person_id: int = Path(
             gt=0,
             example=123
@@ -207,7 +306,7 @@ def show_person(
     path="/person/{person_id}",
     status_code=status.HTTP_200_OK,
     tags=["Persons"])
-def update_person(
+async def update_person(
         person_id: int = Path(
             title="Person ID",
             description="This is the person ID",
@@ -217,9 +316,8 @@ def update_person(
         person: Person = Body(),
         location: Location = Body()
 ):
-    result = person.dict()
-    result.update(location.dict())
-    return result
+    # Field values are already validated and flat, merge them without .dict() copies
+    return json_response({**person.__dict__, **location.__dict__})
 
 
 @app.post(
@@ -229,8 +327,13 @@ def update_person(
     response_model_exclude={'password'},
     tags=["Login", "Persons"]
 )
-def login(username: str = Form(...), password: SecretStr = Form(...)):
-    return LoginOut(username=username, password=password)
+async def login(
+        username: str = Form(..., max_length=20),
+        password: SecretStr = Form(..., min_length=2, max_length=20)
+):
+    # Form already enforces LoginOut's length constraints, so skip revalidating
+    login_out = LoginOut.construct(username=username, password=password.get_secret_value())
+    return json_response(login_out.dict(exclude={'password'}))
 
 
 #  Cookies and headers parameters
@@ -240,7 +343,7 @@ def login(username: str = Form(...), password: SecretStr = Form(...)):
     status_code=status.HTTP_200_OK,
     tags=["Contacts"]
 )
-def contact(
+async def contact(
         first_name: str = Form(
             max_length=20,
             min_length=1
@@ -249,7 +352,7 @@ def contact(
             max_length=20,
             min_length=1
         ),
-        email: EmailStr = Form(),
+        email: FastEmailStr = Form(),
         message: str = Form(
             min_length=20
         ),
@@ -263,11 +366,15 @@ def contact(
     path="/post-image",
     tags=["Image"]
 )
-def post_image(
+async def post_image(
         image: UploadFile = File()
 ):
+    # Measure the upload by seeking to its end instead of reading it into memory
+    image.file.seek(0, os.SEEK_END)
+    size = image.file.tell()
+    image.file.seek(0)
     return {
         "Filename": image.filename,
         "Format": image.content_type,
-        "Size(kb)": round(len(image.file.read()) / 1024, 2)
+        "Size(kb)": round(size / 1024, 2)
     }